@@ -3,8 +3,12 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.figure_factory as ff
+
+# Optional: LTTB downsampling keeps the timeline light with multi-year data
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:
+    FigureResampler = None
 
 # Configure page
 st.set_page_config(
@@ -97,78 +101,325 @@ season_months_days = {
     }
 }
 
-def calc_kwh_summer(irradiance, humidity, wind_speed, ambient_temp, tilt_angle):
-    return (0.25 * irradiance
-            - 0.05 * humidity
-            + 0.02 * wind_speed
-            + 0.1 * ambient_temp
-            - 0.03 * abs(tilt_angle - 30))
-
-def calc_kwh_monsoon(irradiance, humidity, wind_speed, ambient_temp, tilt_angle):
-    return (0.15 * irradiance
-            - 0.1 * humidity
-            + 0.01 * wind_speed
-            + 0.05 * ambient_temp
-            - 0.04 * abs(tilt_angle - 30))
-
-def calc_kwh_winter(irradiance, humidity, wind_speed, ambient_temp, tilt_angle):
-    return (0.18 * irradiance
-            - 0.03 * humidity
-            + 0.015 * wind_speed
-            + 0.08 * ambient_temp
-            - 0.02 * abs(tilt_angle - 30))
+# Months in seasonal-year order, derived once from season_months_days
+MONTH_ORDER = tuple(m for months in season_months_days.values() for m in months)
+
+# Numeric feature columns used for correlations and summaries
+numeric_cols = ['irradiance', 'humidity', 'wind_speed', 'ambient_temperature', 'tilt_angle', 'kwh']
+
+# Shared chart styling, built once instead of per figure per rerun
+SEASON_COLORS = {
+    'summer': '#FF6B35',
+    'monsoon': '#2E86AB',
+    'winter': '#A23B72'
+}
+
+BASE_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(size=12)
+)
+
+# Per-season kwh coefficients: irradiance, humidity, wind_speed,
+# ambient_temperature, and the |tilt - 30| penalty (subtracted)
+SEASON_COEFF_INDEX = {'summer': 0, 'monsoon': 1, 'winter': 2}
+SEASON_COEFFS = np.array([
+    [0.25, -0.05, 0.02, 0.1, 0.03],    # summer
+    [0.15, -0.1, 0.01, 0.05, 0.04],    # monsoon
+    [0.18, -0.03, 0.015, 0.08, 0.02],  # winter
+], dtype=np.float32)
 
 @st.cache_data
 def generate_seasonal_data(season, feature_ranges, months_days):
-    """Generate data for a specific season"""
-    data = []
+    """Generate one flat array per column for a specific season"""
     season_ranges = feature_ranges[season]
     season_months = months_days[season]
-    
-    # Select appropriate calculation function
-    if season == 'summer':
-        calc_func = calc_kwh_summer
-    elif season == 'monsoon':
-        calc_func = calc_kwh_monsoon
-    elif season == 'winter':
-        calc_func = calc_kwh_winter
-    
-    for month, days in season_months.items():
-        for _ in range(days):
-            irr = np.random.uniform(*season_ranges['irradiance'])
-            hum = np.random.uniform(*season_ranges['humidity'])
-            wind = np.random.uniform(*season_ranges['wind_speed'])
-            temp = np.random.uniform(*season_ranges['ambient_temperature'])
-            tilt = np.random.uniform(*season_ranges['tilt_angle'])
-
-            kwh = calc_func(irr, hum, wind, temp, tilt)
-
-            data.append({
-                'irradiance': round(irr, 2),
-                'humidity': round(hum, 2),
-                'wind_speed': round(wind, 2),
-                'ambient_temperature': round(temp, 2),
-                'tilt_angle': round(tilt, 2),
-                'kwh': round(kwh, 2),
-                'season': season,
-                'month': month
-            })
-    
-    return pd.DataFrame(data)
+
+    # Seeded PCG64 stream per season: faster bulk draws than the legacy
+    # global RNG and identical data across app restarts
+    rng = np.random.default_rng((42, ['summer', 'monsoon', 'winter'].index(season)))
+
+    n_days = sum(season_months.values())
+    irr = rng.uniform(*season_ranges['irradiance'], size=n_days)
+    hum = rng.uniform(*season_ranges['humidity'], size=n_days)
+    wind = rng.uniform(*season_ranges['wind_speed'], size=n_days)
+    temp = rng.uniform(*season_ranges['ambient_temperature'], size=n_days)
+    tilt = rng.uniform(*season_ranges['tilt_angle'], size=n_days)
+
+    # One broadcast expression over the season's coefficient row
+    c = SEASON_COEFFS[SEASON_COEFF_INDEX[season]]
+    kwh = (c[0] * irr + c[1] * hum + c[2] * wind + c[3] * temp
+           - c[4] * np.abs(tilt - 30))
+
+    return {
+        'irradiance': irr,
+        'humidity': hum,
+        'wind_speed': wind,
+        'ambient_temperature': temp,
+        'tilt_angle': tilt,
+        'kwh': kwh,
+        'season': np.repeat(season, n_days),
+        'month': np.repeat(list(season_months.keys()), list(season_months.values()))
+    }
 
 @st.cache_data
 def generate_all_seasons_data():
     """Generate data for all seasons and combine them"""
-    all_data = []
-    
-    for season in ['summer', 'monsoon', 'winter']:
-        season_df = generate_seasonal_data(season, feature_ranges, season_months_days)
-        all_data.append(season_df)
-    
-    # Combine all seasonal data
-    combined_df = pd.concat(all_data, ignore_index=True)
+    all_data = [
+        generate_seasonal_data(season, feature_ranges, season_months_days)
+        for season in ['summer', 'monsoon', 'winter']
+    ]
+
+    # One flat buffer per column, then a single DataFrame build: no frame
+    # concat and no list-of-dict dtype inference
+    combined_df = pd.DataFrame({
+        col: np.concatenate([season_data[col] for season_data in all_data])
+        for col in all_data[0]
+    })
+    combined_df = combined_df.round({
+        'irradiance': 2,
+        'humidity': 2,
+        'wind_speed': 2,
+        'ambient_temperature': 2,
+        'tilt_angle': 2,
+        'kwh': 2
+    })
+    # float32 is ample for 2-decimal values and halves the bytes every
+    # reduction and filter gather has to move
+    for col in numeric_cols:
+        combined_df[col] = combined_df[col].astype(np.float32)
+    combined_df.insert(0, 'day', np.arange(1, len(combined_df) + 1))
+
+    # Categorical dtypes: 1-byte codes instead of object strings, which makes
+    # the isin filters and groupbys code-based instead of string-based
+    combined_df['season'] = pd.Categorical(
+        combined_df['season'], categories=['summer', 'monsoon', 'winter']
+    )
+    combined_df['month'] = pd.Categorical(
+        combined_df['month'], categories=list(MONTH_ORDER), ordered=True
+    )
     return combined_df
 
+@st.cache_data
+def filter_data(season_key, month_key, kwh_range):
+    """Return the frame for one sidebar selection, cached per selection"""
+    df = generate_all_seasons_data()
+    season_mask = df['season'].isin(set(season_key))
+    month_mask = df['month'].isin(set(month_key))
+    kwh_mask = df['kwh'].between(*kwh_range)
+    return df.loc[season_mask & month_mask & kwh_mask]
+
+@st.cache_data
+def compute_metrics(season_key, month_key, kwh_range):
+    """Headline metrics for the current selection"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    kwh = filtered_df['kwh'].to_numpy()
+    irradiance = filtered_df['irradiance'].to_numpy()
+    if kwh.size == 0:
+        return {'count': 0, 'avg_kwh': np.nan, 'max_kwh': np.nan, 'avg_irradiance': np.nan}
+    return {
+        'count': kwh.size,
+        'avg_kwh': kwh.mean(),
+        'max_kwh': kwh.max(),
+        'avg_irradiance': irradiance.mean()
+    }
+
+@st.cache_data
+def compute_corr(season_key, month_key, kwh_range):
+    """Correlation matrix for the current selection in one np.corrcoef pass"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    # Force C order: pandas can hand back an F-ordered block, which slows
+    # the row-wise passes inside np.corrcoef
+    mat = np.ascontiguousarray(filtered_df[numeric_cols].to_numpy(dtype=np.float32))
+    corr = np.corrcoef(mat, rowvar=False)
+    return pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
+
+@st.cache_data
+def compute_monthly_avg(season_key, month_key, kwh_range):
+    """Average KWH per month for the current selection"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    # The ordered month categorical keeps groups in seasonal-year order, so
+    # no Categorical reassignment or sort_values is needed; dropna discards
+    # the category slots the filter excluded
+    monthly_avg = filtered_df.groupby('month', observed=False)['kwh'].mean().reset_index()
+    return monthly_avg.dropna(subset=['kwh'])
+
+@st.cache_data
+def compute_seasonal_summary(season_key, month_key, kwh_range):
+    """Per-season aggregates in a single groupby pass over categorical codes"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    return filtered_df.groupby('season', observed=True).agg({
+        'kwh': ['mean', 'std', 'min', 'max'],
+        'irradiance': 'mean',
+        'humidity': 'mean',
+        'ambient_temperature': 'mean'
+    }).round(2)
+
+@st.cache_data
+def compute_describe(season_key, month_key, kwh_range):
+    """Pre-rounded summary statistics for the current selection"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    return filtered_df[numeric_cols].describe().round(2)
+
+# Figure builders: cache_resource hands back the already-built go.Figure on
+# every rerun with the same selection; the figures are never mutated after
+# creation, so sharing the objects is safe
+
+@st.cache_resource
+def make_timeline_figure(season_key, month_key, kwh_range):
+    """Daily KWH timeline, one WebGL line per season"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    if FigureResampler is not None:
+        fig = FigureResampler(go.Figure(), default_n_shown_samples=1000)
+    else:
+        fig = go.Figure()
+    for season in ['summer', 'monsoon', 'winter']:
+        season_df = filtered_df[filtered_df['season'] == season]
+        trace = go.Scattergl(
+            mode='lines',
+            name=season,
+            line=dict(color=SEASON_COLORS[season])
+        )
+        if FigureResampler is not None:
+            fig.add_trace(trace, hf_x=season_df['day'], hf_y=season_df['kwh'])
+        else:
+            fig.add_trace(trace.update(x=season_df['day'], y=season_df['kwh']))
+    fig.update_layout(
+        title='Daily KWH Production',
+        xaxis_title='day',
+        yaxis_title='kwh',
+        **BASE_LAYOUT
+    )
+    return fig
+
+@st.cache_resource
+def make_season_box_figure(season_key, month_key, kwh_range):
+    """KWH distribution per season"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    fig = px.box(
+        filtered_df,
+        x='season',
+        y='kwh',
+        color='season',
+        title='KWH Distribution by Season',
+        color_discrete_map=SEASON_COLORS
+    )
+    fig.update_layout(**BASE_LAYOUT)
+    return fig
+
+@st.cache_resource
+def make_monthly_bar_figure(season_key, month_key, kwh_range):
+    """Average KWH per month"""
+    monthly_avg = compute_monthly_avg(season_key, month_key, kwh_range)
+    fig = px.bar(
+        monthly_avg,
+        x='month',
+        y='kwh',
+        title='Average KWH by Month',
+        color='kwh',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(**BASE_LAYOUT)
+    return fig
+
+@st.cache_resource
+def make_irradiance_figure(season_key, month_key, kwh_range):
+    """Irradiance vs KWH, WebGL markers sized by temperature"""
+    df = generate_all_seasons_data()
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    fig = go.Figure()
+    temp_sizeref = 2.0 * df['ambient_temperature'].max() / (20.0 ** 2)
+    for season in ['summer', 'monsoon', 'winter']:
+        season_df = filtered_df[filtered_df['season'] == season]
+        fig.add_trace(go.Scattergl(
+            x=season_df['irradiance'],
+            y=season_df['kwh'],
+            mode='markers',
+            name=season,
+            opacity=0.6,
+            marker=dict(
+                color=SEASON_COLORS[season],
+                size=season_df['ambient_temperature'],
+                sizemode='area',
+                sizeref=temp_sizeref
+            ),
+            customdata=season_df[['humidity', 'wind_speed']],
+            hovertemplate=('irradiance=%{x}<br>kwh=%{y}<br>'
+                           'humidity=%{customdata[0]}<br>'
+                           'wind_speed=%{customdata[1]}'
+                           '<extra>' + season + '</extra>')
+        ))
+    fig.update_layout(
+        title='Irradiance vs KWH Production',
+        xaxis_title='irradiance',
+        yaxis_title='kwh',
+        **BASE_LAYOUT
+    )
+    return fig
+
+@st.cache_resource
+def make_temperature_figure(season_key, month_key, kwh_range):
+    """Temperature vs KWH, WebGL markers sized by wind speed"""
+    df = generate_all_seasons_data()
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    fig = go.Figure()
+    wind_sizeref = 2.0 * df['wind_speed'].max() / (20.0 ** 2)
+    for season in ['summer', 'monsoon', 'winter']:
+        season_df = filtered_df[filtered_df['season'] == season]
+        fig.add_trace(go.Scattergl(
+            x=season_df['ambient_temperature'],
+            y=season_df['kwh'],
+            mode='markers',
+            name=season,
+            opacity=0.6,
+            marker=dict(
+                color=SEASON_COLORS[season],
+                size=season_df['wind_speed'],
+                sizemode='area',
+                sizeref=wind_sizeref
+            ),
+            customdata=season_df[['humidity', 'irradiance']],
+            hovertemplate=('ambient_temperature=%{x}<br>kwh=%{y}<br>'
+                           'humidity=%{customdata[0]}<br>'
+                           'irradiance=%{customdata[1]}'
+                           '<extra>' + season + '</extra>')
+        ))
+    fig.update_layout(
+        title='Temperature vs KWH Production',
+        xaxis_title='ambient_temperature',
+        yaxis_title='kwh',
+        **BASE_LAYOUT
+    )
+    return fig
+
+@st.cache_resource
+def make_corr_figure(season_key, month_key, kwh_range):
+    """Feature correlation heatmap"""
+    corr_matrix = compute_corr(season_key, month_key, kwh_range)
+    fig = px.imshow(
+        corr_matrix,
+        title='Feature Correlation Matrix',
+        aspect='auto',
+        color_continuous_scale='RdBu_r'
+    )
+    fig.update_layout(**BASE_LAYOUT)
+    return fig
+
+@st.cache_resource
+def make_distribution_figure(season_key, month_key, kwh_range):
+    """KWH histogram with marginal box plot"""
+    filtered_df = filter_data(season_key, month_key, kwh_range)
+    fig = px.histogram(
+        filtered_df,
+        x='kwh',
+        color='season',
+        title='KWH Distribution',
+        marginal='box',
+        color_discrete_map=SEASON_COLORS
+    )
+    fig.update_layout(**BASE_LAYOUT)
+    return fig
+
 # Main app
 def main():
     st.markdown('<h1 class="main-header">☀️ Solar Panel Energy Analytics Dashboard</h1>', unsafe_allow_html=True)
@@ -194,12 +445,6 @@ def main():
         default=available_months
     )
     
-    # Filter data
-    filtered_df = df[
-        (df['season'].isin(selected_seasons)) & 
-        (df['month'].isin(selected_months))
-    ]
-    
     # KWH range filter
     kwh_min, kwh_max = st.sidebar.slider(
         "KWH Range:",
@@ -208,190 +453,104 @@ def main():
         value=(float(df['kwh'].min()), float(df['kwh'].max())),
         step=0.1
     )
-    
-    filtered_df = filtered_df[
-        (filtered_df['kwh'] >= kwh_min) & 
-        (filtered_df['kwh'] <= kwh_max)
-    ]
+
+    # Cache keys: sorted tuples are canonical regardless of the order the
+    # user clicked the options in (streamlit hashes frozensets in iteration
+    # order, which is not stable across insertion orders)
+    season_key = tuple(sorted(selected_seasons))
+    month_key = tuple(sorted(selected_months))
+    kwh_range = (kwh_min, kwh_max)
+
+    filtered_df = filter_data(season_key, month_key, kwh_range)
     
     # Key Metrics
     st.markdown('<h2 class="sub-header">📊 Key Performance Metrics</h2>', unsafe_allow_html=True)
     
+    metrics = compute_metrics(season_key, month_key, kwh_range)
+
     col1, col2, col3, col4 = st.columns(4)
-    
+
     with col1:
         st.metric(
             label="Total Data Points",
-            value=f"{len(filtered_df):,}",
-            delta=f"{len(filtered_df) - len(df):,}"
+            value=f"{metrics['count']:,}",
+            delta=f"{metrics['count'] - len(df):,}"
         )
-    
+
     with col2:
-        avg_kwh = filtered_df['kwh'].mean()
         st.metric(
             label="Average KWH",
-            value=f"{avg_kwh:.2f}",
-            delta=f"{avg_kwh - df['kwh'].mean():.2f}"
+            value=f"{metrics['avg_kwh']:.2f}",
+            delta=f"{metrics['avg_kwh'] - df['kwh'].mean():.2f}"
         )
-    
+
     with col3:
-        max_kwh = filtered_df['kwh'].max()
         st.metric(
             label="Peak KWH",
-            value=f"{max_kwh:.2f}",
-            delta=f"{max_kwh - df['kwh'].max():.2f}"
+            value=f"{metrics['max_kwh']:.2f}",
+            delta=f"{metrics['max_kwh'] - df['kwh'].max():.2f}"
         )
-    
+
     with col4:
-        avg_irradiance = filtered_df['irradiance'].mean()
         st.metric(
             label="Avg Irradiance",
-            value=f"{avg_irradiance:.1f}",
-            delta=f"{avg_irradiance - df['irradiance'].mean():.1f}"
+            value=f"{metrics['avg_irradiance']:.1f}",
+            delta=f"{metrics['avg_irradiance'] - df['irradiance'].mean():.1f}"
         )
     
     # Main visualizations
     st.markdown('<h2 class="sub-header">📈 Energy Production Analysis</h2>', unsafe_allow_html=True)
-    
+
+    # Daily KWH timeline
+    st.plotly_chart(make_timeline_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     # Row 1: KWH trends
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # KWH by Season
-        fig_season = px.box(
-            filtered_df, 
-            x='season', 
-            y='kwh',
-            color='season',
-            title='KWH Distribution by Season',
-            color_discrete_map={
-                'summer': '#FF6B35',
-                'monsoon': '#2E86AB',
-                'winter': '#A23B72'
-            }
-        )
-        fig_season.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=12)
-        )
-        st.plotly_chart(fig_season, use_container_width=True)
-    
+        st.plotly_chart(make_season_box_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     with col2:
         # KWH by Month
-        monthly_avg = filtered_df.groupby('month')['kwh'].mean().reset_index()
-        fig_month = px.bar(
-            monthly_avg,
-            x='month',
-            y='kwh',
-            title='Average KWH by Month',
-            color='kwh',
-            color_continuous_scale='Viridis'
-        )
-        fig_month.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=12)
-        )
-        st.plotly_chart(fig_month, use_container_width=True)
-    
+        st.plotly_chart(make_monthly_bar_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     # Row 2: Environmental factors
     st.markdown('<h2 class="sub-header">🌡️ Environmental Factors Impact</h2>', unsafe_allow_html=True)
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Irradiance vs KWH
-        fig_irr = px.scatter(
-            filtered_df,
-            x='irradiance',
-            y='kwh',
-            color='season',
-            size='ambient_temperature',
-            hover_data=['humidity', 'wind_speed'],
-            title='Irradiance vs KWH Production',
-            color_discrete_map={
-                'summer': '#FF6B35',
-                'monsoon': '#2E86AB',
-                'winter': '#A23B72'
-            }
-        )
-        fig_irr.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_irr, use_container_width=True)
-    
+        st.plotly_chart(make_irradiance_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     with col2:
         # Temperature vs KWH
-        fig_temp = px.scatter(
-            filtered_df,
-            x='ambient_temperature',
-            y='kwh',
-            color='season',
-            size='wind_speed',
-            hover_data=['humidity', 'irradiance'],
-            title='Temperature vs KWH Production',
-            color_discrete_map={
-                'summer': '#FF6B35',
-                'monsoon': '#2E86AB',
-                'winter': '#A23B72'
-            }
-        )
-        fig_temp.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_temp, use_container_width=True)
-    
+        st.plotly_chart(make_temperature_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     # Row 3: Correlation and distribution
     st.markdown('<h2 class="sub-header">🔍 Advanced Analytics</h2>', unsafe_allow_html=True)
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Correlation heatmap
-        numeric_cols = ['irradiance', 'humidity', 'wind_speed', 'ambient_temperature', 'tilt_angle', 'kwh']
-        corr_matrix = filtered_df[numeric_cols].corr()
-        
-        fig_corr = px.imshow(
-            corr_matrix,
-            title='Feature Correlation Matrix',
-            aspect='auto',
-            color_continuous_scale='RdBu_r'
-        )
-        fig_corr.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_corr, use_container_width=True)
-    
+        st.plotly_chart(make_corr_figure(season_key, month_key, kwh_range), use_container_width=True)
+
     with col2:
         # KWH distribution
-        fig_dist = px.histogram(
-            filtered_df,
-            x='kwh',
-            color='season',
-            title='KWH Distribution',
-            marginal='box',
-            color_discrete_map={
-                'summer': '#FF6B35',
-                'monsoon': '#2E86AB',
-                'winter': '#A23B72'
-            }
-        )
-        fig_dist.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_dist, use_container_width=True)
+        st.plotly_chart(make_distribution_figure(season_key, month_key, kwh_range), use_container_width=True)
     
     # Data table
     st.markdown('<h2 class="sub-header">📋 Data Explorer</h2>', unsafe_allow_html=True)
     
     # Summary statistics
     st.markdown("### Summary Statistics")
-    st.dataframe(filtered_df.describe(), use_container_width=True)
+    st.table(compute_describe(season_key, month_key, kwh_range))
+
+    # Seasonal summary
+    st.markdown("### Seasonal Summary")
+    st.dataframe(compute_seasonal_summary(season_key, month_key, kwh_range), use_container_width=True)
     
     # Raw data with search and filter
     st.markdown("### Raw Data")